@@ -3,59 +3,393 @@
 PDF Analysis Tool - Examine PDF structure and content
 """
 
+import io
+import os
+import re
 import sys
-import pdfplumber
+import json
+import hashlib
+import functools
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
 
-def analyze_pdf(pdf_path: str):
+CACHE_DIR = Path(".cache")
+# Bump when the cached page results change shape or content
+CACHE_VERSION = 2
+# PDFs below this size are read into memory; larger ones stream from disk
+IN_MEMORY_LIMIT = 512 * 1024 * 1024
+# Number of text characters shown per page
+TEXT_PREVIEW_CHARS = 500
+# Report separators, built once at import time
+_BANNER = "=" * 50
+_SEP = "-" * 20
+_SEP_LINE = f"{_SEP}\n"
+
+def _fingerprint(path: str, data: Optional[bytes] = None) -> str:
+    """Content hash of the PDF file, used as the cache key"""
+    h = hashlib.blake2b(digest_size=16)
+    if data is not None:
+        h.update(data)
+    else:
+        # Files too large to keep in memory are hashed in 1 MiB chunks
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def _text_backend():
+    """Return the pypdfium2 module when it imports cleanly, else None (PyPDF2 is used)"""
+    try:
+        import pypdfium2
+    except ImportError:
+        return None
+    return pypdfium2
+
+def _cache_path(pdf_path: str, text_only: bool, pages: Optional[List[int]] = None,
+                data: Optional[bytes] = None) -> Path:
+    """Cache file for a PDF; text-only and page-range results are stored separately"""
+    # The text (and so word/line counts) depends on which engine extracted it
+    backend = "pdfium" if _text_backend() is not None else "pypdf2"
+    suffix = f"-v{CACHE_VERSION}-{backend}"
+    suffix += "-text" if text_only else ""
+    if pages:
+        suffix += "-p" + hashlib.blake2b(repr(pages).encode(), digest_size=4).hexdigest()
+    return CACHE_DIR / f"{_fingerprint(pdf_path, data)}{suffix}.json"
+
+def _parse_pages(spec: str) -> List[int]:
+    """Parse a page selection like "1,3,5-7" into a sorted list of 1-based page numbers"""
+    pages = set()
+    try:
+        for part in spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                start, end = map(int, part.split('-', 1))
+                pages.update(range(start, end + 1))
+            else:
+                pages.add(int(part))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid page selection: {spec!r}")
+
+    if not pages or min(pages) < 1:
+        raise argparse.ArgumentTypeError(f"invalid page selection: {spec!r}")
+    return sorted(pages)
+
+def _load_cache(cache_file: Path) -> Optional[List[Dict]]:
+    """Load cached page results, or None on a miss or unreadable entry"""
+    if not cache_file.exists():
+        return None
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_cache(cache_file: Path, results: List[Dict]) -> None:
+    """Write page results to the cache atomically (tmp file + os.replace)"""
+    try:
+        cache_file.parent.mkdir(exist_ok=True)
+        tmp_file = cache_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write cache {cache_file}: {e}", file=sys.stderr)
+
+def _read_small_pdf(pdf_path: str) -> Optional[bytes]:
+    """Read the PDF into memory, or return None for huge files that should stream from disk"""
+    if Path(pdf_path).stat().st_size < IN_MEMORY_LIMIT:
+        return Path(pdf_path).read_bytes()
+    return None
+
+def _open_source(pdf_path: str, shm_name: Optional[str] = None, size: int = 0) -> Union[str, io.BytesIO]:
+    """Return an in-memory copy of the PDF from shared memory, or the path itself for huge files"""
+    if shm_name is None:
+        return pdf_path
+
+    # pdfminer does many small seeks/reads; serving them from memory avoids the syscalls,
+    # and the parent has already read the file once for all workers
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return io.BytesIO(bytes(shm.buf[:size]))
+    finally:
+        shm.close()
+
+def _extract_tables(page) -> List:
+    """Extract table rows from a pdfplumber page, skipping cell extraction when no tables are found"""
+    # Image-only/scanned pages have almost no vector text or ruling lines: nothing to detect.
+    # Counting the raw objects avoids building page.edges (an edge dict per line, rect side and
+    # curve segment) for pages that are skipped anyway
+    objs = page.objects
+    if (len(objs.get("char", [])) < 10 and len(objs.get("line", [])) < 4
+            and not objs.get("rect") and not objs.get("curve")):
+        return []
+
+    # find_tables() only runs edge/cell detection; text is extracted per table afterwards
+    finders = page.find_tables()
+    return [t.extract() for t in finders] if finders else []
+
+def _extract_text(source: Union[str, io.BytesIO], page_index: int) -> str:
+    """Extract plain text from one page, preferring PDFium when pypdfium2 is installed"""
+    pdfium = _text_backend()
+    if pdfium is not None:
+        # PDFium is Google's C++ PDF engine; text extraction runs in native code, not Python
+        doc = pdfium.PdfDocument(source)
+        try:
+            page = doc[page_index]
+            textpage = page.get_textpage()
+            # PDFium separates lines with CRLF
+            text = textpage.get_text_range().replace("\r\n", "\n")
+            textpage.close()
+            page.close()
+        finally:
+            doc.close()
+    else:
+        # PyPDF2 still skips pdfminer's layout analysis
+        from PyPDF2 import PdfReader
+        text = PdfReader(source).pages[page_index].extract_text()
+
+    if isinstance(source, io.BytesIO):
+        source.seek(0)
+    return text or ""
+
+def _process_page(pdf_path: str, page_number: int, text_only: bool = False,
+                  shm_name: Optional[str] = None, size: int = 0) -> Dict:
+    """Extract text and tables from a single page (runs in a worker process)"""
+    source = _open_source(pdf_path, shm_name, size)
+
+    text = _extract_text(source, page_number - 1)
+    # Field order is kept stable so --json output diffs cleanly between runs
+    result = {
+        "page_number": page_number,
+        "word_count": len(text.split()),
+        "line_count": len(text.splitlines()),
+        "text": text,
+        "tables": None
+    }
+    if text_only:
+        return result
+
+    # Imported here so --help, usage errors and --text-only don't pay for pdfminer's import time
+    import pdfplumber
+
+    # pdfplumber objects cannot be pickled, so each worker reopens the PDF,
+    # loading only the page it needs
+    with pdfplumber.open(source, pages=[page_number]) as pdf:
+        page = pdf.pages[0]
+        result["tables"] = _extract_tables(page)
+        # Workers are reused across pages; drop the cached chars/objects right away
+        page.flush_cache()
+        del page
+    return result
+
+def _load_patterns(patterns_path: str) -> List[str]:
+    """Read scan patterns, one regular expression per line (blank lines and # comments ignored)"""
+    with open(patterns_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def _build_scanner(patterns: List[str]) -> Callable[[str], List[str]]:
+    """Compile patterns once and return a function listing the patterns found in a text"""
+    try:
+        import hyperscan
+    except ImportError:
+        hyperscan = None
+
+    if hyperscan is not None:
+        # Multi-pattern DFA: all patterns are matched in a single pass over the text
+        db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        db.compile(
+            expressions=[p.encode('utf-8') for p in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8] * len(patterns)
+        )
+
+        def scan(text: str) -> List[str]:
+            found = set()
+
+            def on_match(pattern_id, start, end, flags, context):
+                found.add(pattern_id)
+
+            db.scan(text.encode('utf-8'), match_event_handler=on_match)
+            return [patterns[i] for i in sorted(found)]
+
+        return scan
+
+    # Fallback: search each pattern on its own, so overlapping matches and
+    # group references behave exactly as they do for a single pattern
+    compiled = [re.compile(p, re.IGNORECASE) for p in patterns]
+
+    def scan(text: str) -> List[str]:
+        return [p for p, regex in zip(patterns, compiled) if regex.search(text)]
+
+    return scan
+
+def _format_page(result: Dict, text_only: bool = False) -> str:
+    """Render one page result as text, so each page is written with a single call"""
+    buf = io.StringIO()
+    buf.write(f"Page {result['page_number']}:\n")
+    buf.write(_SEP_LINE)
+
+    # Extract text
+    text = result["text"]
+    if text:
+        buf.write("Text content:\n")
+        suffix = "..." if len(text) > TEXT_PREVIEW_CHARS else ""
+        buf.write(f"{text[:TEXT_PREVIEW_CHARS]}{suffix}\n")
+        buf.write("\n")
+
+    # Pattern matches (only with --scan)
+    if "matches" in result:
+        if result["matches"]:
+            buf.write(f"Pattern matches: {', '.join(result['matches'])}\n")
+        else:
+            buf.write("No pattern matches on this page.\n")
+        buf.write("\n")
+
+    # Extract tables (skipped with --text-only)
+    if not text_only:
+        tables = result["tables"]
+        if tables:
+            buf.write(f"Found {len(tables)} table(s):\n")
+            for j, table in enumerate(tables):
+                buf.write(f"  Table {j+1}:\n")
+                # Show first few rows
+                for k, row in enumerate(table[:5]):
+                    buf.write(f"    Row {k}: {row}\n")
+                if len(table) > 5:
+                    buf.write(f"    ... and {len(table) - 5} more rows\n")
+                buf.write("\n")
+        else:
+            buf.write("No tables found on this page.\n")
+
+    buf.write("\n")
+    return buf.getvalue()
+
+def _collect_results(pdf_path: str, text_only: bool = False, pages: Optional[List[int]] = None) -> List[Dict]:
+    """Extract all requested pages, reusing cached results when the file is unchanged"""
+    from PyPDF2 import PdfReader
+
+    data = _read_small_pdf(pdf_path)
+    cache_file = _cache_path(pdf_path, text_only, pages, data)
+    results = _load_cache(cache_file)
+    if results is not None:
+        return results
+
+    page_count = len(PdfReader(io.BytesIO(data) if data is not None else pdf_path).pages)
+    if pages and pages[-1] > page_count:
+        raise ValueError(f"page {pages[-1]} out of range (document has {page_count} pages)")
+    page_numbers = pages or range(1, page_count + 1)
+
+    # Publish the file bytes once so workers don't each re-read the PDF from disk
+    shm = None
+    if data is not None:
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[:len(data)] = data
+
+    try:
+        shm_name = shm.name if shm is not None else None
+        size = len(data) if data is not None else 0
+
+        # Pages are independent, so process them in parallel and keep results in page order
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, 4)) as ex:
+            results = list(ex.map(_process_page, repeat(pdf_path), page_numbers, repeat(text_only),
+                                  repeat(shm_name), repeat(size)))
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    _save_cache(cache_file, results)
+    return results
+
+def _scan_results(results: List[Dict], scan: Callable[[str], List[str]]) -> None:
+    """Record the patterns matched on each page under the "matches" key"""
+    for result in results:
+        result["matches"] = scan(result["text"] or "")
+
+def analyze_pdf(pdf_path: str, text_only: bool = False, pages: Optional[List[int]] = None,
+                as_json: bool = False, scan_patterns: Optional[List[str]] = None):
     """Analyze PDF structure and extract all available data"""
+    if as_json:
+        # Structured output only; errors go to stderr so stdout stays valid JSON
+        try:
+            # Compile the patterns first so a bad one fails before any extraction work
+            scan = _build_scanner(scan_patterns) if scan_patterns else None
+            results = _collect_results(pdf_path, text_only, pages)
+            if scan is not None:
+                _scan_results(results, scan)
+        except Exception as e:
+            print(f"Error analyzing PDF: {e}", file=sys.stderr)
+            return
+        json.dump(results, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+
     print(f"Analyzing: {pdf_path}")
-    print("=" * 50)
-
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            print(f"Total pages: {len(pdf.pages)}")
-            print()
-
-            for i, page in enumerate(pdf.pages):
-                print(f"Page {i+1}:")
-                print("-" * 20)
-
-                # Extract text
-                text = page.extract_text()
-                if text:
-                    print("Text content:")
-                    print(text[:500] + "..." if len(text) > 500 else text)
-                    print()
-
-                # Extract tables
-                tables = page.extract_tables()
-                if tables:
-                    print(f"Found {len(tables)} table(s):")
-                    for j, table in enumerate(tables):
-                        print(f"  Table {j+1}:")
-                        # Show first few rows
-                        for k, row in enumerate(table[:5]):
-                            print(f"    Row {k}: {row}")
-                        if len(table) > 5:
-                            print(f"    ... and {len(table) - 5} more rows")
-                        print()
-                else:
-                    print("No tables found on this page.")
-
-                print()
+    print(_BANNER)
+
+    try:
+        scan = _build_scanner(scan_patterns) if scan_patterns else None
+        results = _collect_results(pdf_path, text_only, pages)
+        if scan is not None:
+            _scan_results(results, scan)
+
+        if pages:
+            print(f"Selected pages: {len(results)}")
+        else:
+            print(f"Total pages: {len(results)}")
+        print()
+
+        for result in results:
+            sys.stdout.write(_format_page(result, text_only))
+            sys.stdout.flush()
 
     except Exception as e:
         print(f"Error analyzing PDF: {e}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python analyze_pdf.py <pdf_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="PDF Analysis Tool - Examine PDF structure and content")
+    parser.add_argument("pdf_file", help="PDF file to analyze")
+    parser.add_argument("--text-only", action="store_true",
+                        help="Extract text only and skip pdfplumber table extraction. Text is extracted "
+                             "with pypdfium2 (PDFium) when installed, otherwise with PyPDF2")
+    parser.add_argument("--pages", type=_parse_pages,
+                        help="Pages to analyze, e.g. 1,3,5-7 (default: all). pdfplumber keeps a lot of "
+                             "per-page data in memory, so analyze very large documents in batches of "
+                             "10-100 pages")
+    parser.add_argument("--json", action="store_true",
+                        help="Print page results as JSON (page_number, word_count, line_count, text, tables)")
+    parser.add_argument("--scan", metavar="PATTERNS_FILE",
+                        help="Report which regular expressions from this file (one per line) match each "
+                             "page's text; uses hyperscan when installed")
+    args = parser.parse_args()
 
-    pdf_file = sys.argv[1]
+    # Page output is already batched, so let stdout buffer freely
+    sys.stdout.reconfigure(line_buffering=False)
+
+    pdf_file = args.pdf_file
     if not Path(pdf_file).exists():
         print(f"File not found: {pdf_file}")
         sys.exit(1)
 
-    analyze_pdf(pdf_file)
\ No newline at end of file
+    scan_patterns = None
+    if args.scan:
+        try:
+            scan_patterns = _load_patterns(args.scan)
+        except OSError as e:
+            print(f"Could not read scan patterns from {args.scan}: {e}")
+            sys.exit(1)
+
+    analyze_pdf(pdf_file, args.text_only, args.pages, args.json, scan_patterns)
+
+    # Skip interpreter teardown of pdfminer's module-level caches; the pool is
+    # already shut down and the cache file written, so only stdout needs flushing
+    sys.stdout.flush()
+    os._exit(0)
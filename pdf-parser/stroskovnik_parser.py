@@ -4,32 +4,87 @@ Stroskovnik PDF Parser - Standalone Tool
 Extracts timesheet data from PDF files and generates processed PDFs
 """
 
+import io
+import os
 import sys
+import random
 import json
 import argparse
-import copy
+import contextlib
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import re
 from typing import Dict, List, Optional, Tuple
 
 import pdfplumber
+from PyPDF2 import PdfReader
+import reportlab.rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfbase.ttfonts import TTFont
 import pandas as pd
 
+# Set up Unicode support
+reportlab.rl_config.warnOnMissingFontGlyphs = 0  # Suppress font warnings
+
+# Regex patterns used while parsing, compiled once at import time
+_NAME_RE = re.compile(r'Ime in priimek:\s*([^\n]+)')
+_HEADER_PERIOD_RE = re.compile(r'STROŠKOVNIK ZA ODBOBJE:\s*([^\n]+)')
+_PERIOD_RE = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})\s*-\s*(\d{2})\.(\d{2})\.(\d{4})')
+_DAY_RE = re.compile(r'(\d{1,2})')
+_MONTH_YEAR_RE = re.compile(r'(\w+)\s+(\d{4})')
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+_WS_RE = re.compile(r'\s+')
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+# First-cell keywords marking total/summary rows in the timesheet table
+_SUMMARY_KEYWORDS = ('vsota', 'total', 'skupaj', 'sum')
+
+# Hour cells use a decimal comma; cells normalizing to one of these hold no hours
+_DECIMAL_COMMA = str.maketrans({',': '.'})
+_ZERO_HOURS = frozenset({'', '0', '0.0'})
+
+# Timesheet page geometry in points: 1 inch page margin plus 6pt frame padding
+_PAGE_MARGIN = 78
+_CELL_PADDING_X = 6
+_HEADER_ROW = {"size": 10, "height": 27, "baseline": 14}
+_BODY_ROW = {"size": 9, "height": 18, "baseline": 6}
+
+# Slovenian month names indexed by month number, and the reverse "01".."12" lookup
+_MONTH_NAMES = ('', 'januar', 'februar', 'marec', 'april', 'maj', 'junij',
+                'julij', 'avgust', 'september', 'oktober', 'november', 'december')
+_MONTH_NUM = {name: f'{i:02d}' for i, name in enumerate(_MONTH_NAMES) if i}
+
+# Precomputed "HH:MM" strings for 0:00-47:59, indexed by minutes since midnight
+_TIME_STRINGS = tuple(f"{h:02d}:{m:02d}" for h in range(48) for m in range(60))
+
+
+def _compute_times(base_minutes: int, variation: int, total_hours: float) -> Tuple[int, int, int]:
+    """Return (arrival, departure, break) minutes for one working day"""
+    arrival_minutes = base_minutes + variation
+    break_minutes = round(30 * (total_hours / 8))
+    work_minutes = round(total_hours * 60)
+    return arrival_minutes, arrival_minutes + work_minutes, break_minutes
+
 
 class StroskovnikPDFParser:
     """Standalone PDF parser for Stroskovnik timesheets"""
 
-    def __init__(self, config_path: Optional[str] = None):
-        self.config = self.load_config(config_path)
-        self.styles = getSampleStyleSheet()
+    # Fonts and reportlab styles shared by every generated PDF, created on first use
+    _fonts_registered = False
+    _title_style: Optional[ParagraphStyle] = None
+    _info_style: Optional[ParagraphStyle] = None
+    _header_font: Optional[str] = None
+    _body_font: Optional[str] = None
+
+    def __init__(self, config_path: Optional[str] = None, config: Optional[Dict] = None):
+        self.config = dict(config) if config is not None else self.load_config(config_path)
 
     def load_config(self, config_path: Optional[str] = None) -> Dict:
         """Load configuration from file or use defaults"""
@@ -65,20 +120,27 @@ class StroskovnikPDFParser:
     def parse_pdf(self, pdf_path: str) -> Optional[Dict]:
         """Parse PDF file and extract timesheet data"""
         try:
+            # The name and period headers only need plain text, so read it with
+            # PyPDF2 and skip pdfplumber's per-char bookkeeping; stop as soon as
+            # both headers have been seen (normally on the first page)
+            text_parts: List[str] = []
+            have_name = have_period = False
+            for page in PdfReader(pdf_path).pages:
+                page_text = (page.extract_text() or "") + "\n"
+                text_parts.append(page_text)
+                have_name = have_name or _NAME_RE.search(page_text) is not None
+                have_period = have_period or _HEADER_PERIOD_RE.search(page_text) is not None
+                if have_name and have_period:
+                    break
+
             with pdfplumber.open(pdf_path) as pdf:
-                text_content = ""
+                # pdfplumber is only used for the table cells
                 tables_data = []
-
-                # Extract text from all pages
                 for page in pdf.pages:
-                    text_content += page.extract_text() + "\n"
-
-                    # Try to extract tables
-                    tables = page.extract_tables()
-                    tables_data.extend(tables)
+                    tables_data.extend(page.extract_tables())
 
-                # Parse the extracted data
-                return self._parse_extracted_data(text_content, tables_data)
+            # Parse the extracted data
+            return self._parse_extracted_data("".join(text_parts), tables_data)
 
         except Exception as e:
             print(f"Error parsing PDF {pdf_path}: {e}")
@@ -87,7 +149,7 @@ class StroskovnikPDFParser:
     def _parse_extracted_data(self, text: str, tables: List) -> Optional[Dict]:
         """Parse extracted text and tables into structured data"""
         # Extract employee name
-        name_match = re.search(r'Ime in priimek:\s*([^\n]+)', text)
+        name_match = _NAME_RE.search(text)
         if not name_match:
             print("Could not extract employee name from PDF")
             return None
@@ -95,14 +157,14 @@ class StroskovnikPDFParser:
         name = name_match.group(1).strip()
 
         # Extract period
-        period_match = re.search(r'STROŠKOVNIK ZA ODBOBJE:\s*([^\n]+)', text)
+        period_match = _HEADER_PERIOD_RE.search(text)
         if not period_match:
             print("Could not extract period from PDF")
             return None
 
         period_str = period_match.group(1).strip()
         # Parse period like "01.09.2025 - 30.09.2025"
-        period_match = re.search(r'(\d{2})\.(\d{2})\.(\d{4})\s*-\s*(\d{2})\.(\d{2})\.(\d{4})', period_str)
+        period_match = _PERIOD_RE.search(period_str)
         if period_match:
             start_day, start_month, start_year = period_match.groups()[:3]
             end_day, end_month, end_year = period_match.groups()[3:]
@@ -130,15 +192,12 @@ class StroskovnikPDFParser:
 
     def _get_month_name(self, month_num: int) -> str:
         """Convert month number to Slovenian month name"""
-        months = {
-            1: 'januar', 2: 'februar', 3: 'marec', 4: 'april', 5: 'maj', 6: 'junij',
-            7: 'julij', 8: 'avgust', 9: 'september', 10: 'oktober', 11: 'november', 12: 'december'
-        }
-        return months.get(month_num, 'oktober')
+        return _MONTH_NAMES[month_num] if 1 <= month_num <= 12 else 'oktober'
 
     def _parse_stroskovnik_table(self, tables: List) -> List[Dict]:
         """Parse the main Stroskovnik timesheet table"""
-        working_days = []
+        # Day entries keyed by day number, for O(1) lookup while accumulating hours
+        by_day: Dict[int, Dict] = {}
 
         for table in tables:
             if not table or len(table) < 2:
@@ -146,9 +205,14 @@ class StroskovnikPDFParser:
 
             # Look for the main timesheet table (has "Dejanske ure" column)
             header = table[0] if table else []
-            header_text = ' '.join(str(cell) for cell in header if cell)
+            header_text = ' '.join([str(cell) for cell in header if cell])
+
+            # Header cells may wrap onto several lines, so compare with whitespace collapsed
+            if 'Dejanske ure' not in ' '.join(header_text.split()):
+                continue
 
-            if 'Dejanske' not in header_text and 'ure' not in header_text:
+            # Without any digits in the header there can be no day columns
+            if not any(c.isdigit() for c in header_text):
                 continue
 
             # Find day columns (they should be numbered 1-30 or similar)
@@ -156,7 +220,7 @@ class StroskovnikPDFParser:
             for i, col in enumerate(header):
                 col_str = str(col).strip()
                 # Look for day numbers in column headers - they can be like "P 1", "T 2", "3", etc.
-                day_match = re.search(r'(\d{1,2})', col_str)
+                day_match = _DAY_RE.search(col_str)
                 if day_match:
                     day_num = int(day_match.group(1))
                     if 1 <= day_num <= 31:
@@ -165,97 +229,80 @@ class StroskovnikPDFParser:
             if not day_columns:
                 continue
 
+            # Flatten once per table instead of re-reading the dict for every row
+            day_items = sorted(day_columns.items())
+            max_col = max(col_idx for _, col_idx in day_items)
+
             # Process each data row (skip header)
             for row in table[1:]:
-                if len(row) <= max(day_columns.values()):
+                if len(row) <= max_col:
                     continue
 
+                # Convert each cell to a string once; pdfplumber cells are already str or None
+                cells = [('' if c is None else c if isinstance(c, str) else str(c)) for c in row]
+
                 # Skip total/summary rows (Vsota, Total, etc.)
-                first_cell = str(row[0]).strip().lower() if len(row) > 0 else ''
-                if any(keyword in first_cell for keyword in ['vsota', 'total', 'skupaj', 'sum']):
+                first_cell = cells[0].strip().lower()
+                if any(keyword in first_cell for keyword in _SUMMARY_KEYWORDS):
                     continue
 
-                # Get work type from column 3 (Šifra vrste dela)
-                work_type_code = str(row[2]).strip() if len(row) > 2 else '001'
-                if work_type_code == '001':
-                    work_type = 'normal-work'
-                elif work_type_code == '002':
-                    work_type = 'business-trip'
-                else:
-                    work_type = 'other'  # Ignore other work types like 010 for time calculations
+                # Work type from column 3 (Šifra vrste dela): 001 normal work, 002 business trip;
+                # other types like 010 are ignored for time calculations
+                work_type_code = cells[2].strip() if len(cells) > 2 else '001'
+                hours_key = {'001': "totalHours001", '002': "totalHours002"}.get(work_type_code)
 
                 # Get project code for reference
-                project_code = str(row[0]).strip() if len(row) > 0 else ''
+                project_code = cells[0].strip()
 
                 # Collect hours for each day
-                for day, col_idx in day_columns.items():
-                    if col_idx >= len(row):
-                        continue
-
-                    hours_str = str(row[col_idx]).replace(',', '.').strip()
-                    if not hours_str or hours_str in ['', '0', '0.0', '0,0']:
+                for day, col_idx in day_items:
+                    hours_str = cells[col_idx].translate(_DECIMAL_COMMA).strip()
+                    if hours_str in _ZERO_HOURS:
                         continue
 
                     try:
                         hours = float(hours_str)
-                        if hours > 0:
-                            # Check if we already have an entry for this day
-                            existing_day = next((d for d in working_days if d["day"] == day), None)
-
-                            if existing_day:
-                                # Add to existing day
-                                if work_type == 'business-trip':
-                                    existing_day["totalHours002"] += hours
-                                elif work_type == 'normal-work':
-                                    existing_day["totalHours001"] += hours
-                                # Ignore 'other' work types for time calculations
-                                existing_day["totalHours"] = existing_day["totalHours001"] + existing_day["totalHours002"]
-                                if existing_day["totalHours002"] > 0:
-                                    existing_day["type"] = "business-trip"
-                                    existing_day["hasBusinessTrip"] = True
-                            else:
-                                # Create new day entry
-                                day_data = {
-                                    "day": day,
-                                    "totalHours001": hours if work_type == 'normal-work' else 0,
-                                    "totalHours002": hours if work_type == 'business-trip' else 0,
-                                    "hasBusinessTrip": work_type == 'business-trip',
-                                    "type": work_type if work_type in ['business-trip', 'normal-work'] else 'normal-work',
-                                    "totalHours": hours if work_type in ['business-trip', 'normal-work'] else 0,
-                                    "projectCode": project_code
-                                }
-                                working_days.append(day_data)
-
                     except ValueError:
                         continue
+                    if not hours > 0:
+                        continue
 
-        # Filter to only include days with normal work hours (001 > 0) or business trip hours (002 > 0)
-        working_days = [d for d in working_days if d["totalHours001"] > 0 or d["totalHours002"] > 0]
-
-        return sorted(working_days, key=lambda x: x["day"])
-
-    def _determine_work_type(self, row: List) -> str:
-        """Determine work type from row content"""
-        row_text = ' '.join(str(cell) for cell in row if cell).lower()
+                    day_data = by_day.get(day)
+                    if day_data is None:
+                        # A day gets an entry from the first row with hours on it, whatever its work type
+                        day_data = {
+                            "day": day,
+                            "totalHours001": 0.0,
+                            "totalHours002": 0.0,
+                            "hasBusinessTrip": False,
+                            "type": "normal-work",
+                            "totalHours": 0.0,
+                            "projectCode": project_code
+                        }
+                        by_day[day] = day_data
+
+                    if hours_key is None:
+                        continue
+                    day_data[hours_key] += hours
+                    day_data["totalHours"] = day_data["totalHours001"] + day_data["totalHours002"]
+                    if hours_key == "totalHours002":
+                        day_data["type"] = "business-trip"
+                        day_data["hasBusinessTrip"] = True
 
-        if '002' in row_text or 'business' in row_text or 'potovanje' in row_text:
-            return '002'
-        else:
-            return '001'  # Default to regular work
+        # Filter to only include days with normal work hours (001 > 0) or business trip hours (002 > 0)
+        return [by_day[day] for day in sorted(by_day)
+                if by_day[day]["totalHours001"] > 0 or by_day[day]["totalHours002"] > 0]
 
-    def calculate_times(self, total_hours: float) -> Dict:
-        """Calculate arrival/departure times with scattering"""
-        import random
+    def calculate_times(self, total_hours: float, variation: Optional[int] = None) -> Dict:
+        """Calculate arrival/departure times with scattering; a pre-drawn variation skips the random draw"""
         hours, minutes = map(int, self.config["arrival_time"].split(':'))
         base_minutes = hours * 60 + minutes
 
-        scattering = self.config["scattering_minutes"]
-        variation = random.randint(-scattering, scattering)
+        if variation is None:
+            scattering = self.config["scattering_minutes"]
+            variation = random.randint(-scattering, scattering)
 
-        arrival_minutes = base_minutes + variation
-        break_minutes = round(30 * (total_hours / 8))
-        work_minutes = round(total_hours * 60)
-        departure_minutes = arrival_minutes + work_minutes
+        arrival_minutes, departure_minutes, break_minutes = _compute_times(base_minutes, variation, total_hours)
 
         return {
             "arrival": self._format_time(arrival_minutes),
@@ -265,69 +312,125 @@ class StroskovnikPDFParser:
 
     def _format_time(self, total_minutes: int) -> str:
         """Format minutes into HH:MM string"""
+        if 0 <= total_minutes < len(_TIME_STRINGS):
+            return _TIME_STRINGS[total_minutes]
         hours = total_minutes // 60
         minutes = total_minutes % 60
         return f"{hours:02d}:{minutes:02d}"
 
-    def generate_pdf(self, data: Dict, output_path: str, secondary_work: Optional[Dict] = None):
-        """Generate PDF with processed timesheet data"""
-        # Ensure times are calculated for consistency
-        self._calculate_times_for_all_days(data)
-        # Set up Unicode support
-        import reportlab.rl_config
-        reportlab.rl_config.warnOnMissingFontGlyphs = 0  # Suppress font warnings
+    @classmethod
+    def _init_pdf_resources(cls) -> None:
+        """Register fonts and build the PDF styles once per process"""
+        if not cls._fonts_registered:
+            # Register Arial font for better Unicode support
+            try:
+                fonts_dir = 'C:/Windows/Fonts'
+                arial_path = os.path.join(fonts_dir, 'arial.ttf')
+                if os.path.exists(arial_path):
+                    pdfmetrics.registerFont(TTFont('Arial', arial_path))
+                    pdfmetrics.registerFont(TTFont('Arial-Bold', os.path.join(fonts_dir, 'arialbd.ttf')))
+                    print("Arial fonts registered for Unicode support")
+                else:
+                    print("Arial font not found, using default fonts")
+            except Exception as e:
+                print(f"Could not register Arial font: {e}")
+            cls._fonts_registered = True
 
-        # Register Arial font for better Unicode support
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        import os
+        if cls._body_font is not None:
+            return
 
-        try:
-            fonts_dir = 'C:/Windows/Fonts'
-            arial_path = os.path.join(fonts_dir, 'arial.ttf')
-            if os.path.exists(arial_path):
-                pdfmetrics.registerFont(TTFont('Arial', arial_path))
-                pdfmetrics.registerFont(TTFont('Arial-Bold', os.path.join(fonts_dir, 'arialbd.ttf')))
-                print("Arial fonts registered for Unicode support")
-            else:
-                print("Arial font not found, using default fonts")
-        except Exception as e:
-            print(f"Could not register Arial font: {e}")
-
-        # Use built-in fonts with UTF-8 encoding
-        doc = SimpleDocTemplate(output_path, pagesize=A4, encoding='utf-8')
-        elements = []
+        styles = getSampleStyleSheet()
+        registered_fonts = pdfmetrics.getRegisteredFontNames()
 
         # Title with Unicode characters
         title_style = ParagraphStyle(
             'CustomTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=16,
             spaceAfter=30,
             alignment=1,  # Center
             encoding='utf-8'
         )
         # Try to use Arial if available, otherwise use default
-        if 'Arial-Bold' in pdfmetrics.getRegisteredFontNames():
+        if 'Arial-Bold' in registered_fonts:
             title_style.fontName = 'Arial-Bold'
 
-        title_text = "Pregled delovnega časa"
-        elements.append(Paragraph(title_text, title_style))
-
         # Employee info
         info_style = ParagraphStyle(
             'InfoStyle',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=12,
             spaceAfter=20,
             alignment=1,
             encoding='utf-8'
         )
-        if 'Arial' in pdfmetrics.getRegisteredFontNames():
+        if 'Arial' in registered_fonts:
             info_style.fontName = 'Arial'
 
+        cls._title_style = title_style
+        cls._info_style = info_style
+        # Determine available fonts
+        cls._header_font = 'Arial-Bold' if 'Arial-Bold' in registered_fonts else 'Helvetica-Bold'
+        cls._body_font = 'Arial' if 'Arial' in registered_fonts else 'Helvetica'
+
+    def _draw_timesheet(self, canv: canvas.Canvas, title: str, info: str, table_data: List[List[str]]) -> None:
+        """Draw the title, employee info and timesheet grid directly on the canvas"""
+        page_width, page_height = A4
+        top = page_height - _PAGE_MARGIN
+        y = top
+
+        # Title and employee info, centered
+        for text, style in ((title, self._title_style), (info, self._info_style)):
+            canv.setFont(style.fontName, style.fontSize)
+            canv.drawCentredString(page_width / 2, y - style.fontSize, text)
+            y -= style.leading + style.spaceAfter
+
+        # Header row first, then body rows; columns fit their widest cell and the table is centered
+        rows = [(table_data[0], self._header_font, _HEADER_ROW)]
+        rows += [(row, self._body_font, _BODY_ROW) for row in table_data[1:]]
+        col_widths = [
+            max(stringWidth(row[c], font, geom["size"]) for row, font, geom in rows) + 2 * _CELL_PADDING_X
+            for c in range(len(table_data[0]))
+        ]
+        xs = [(page_width - sum(col_widths)) / 2]
+        for width in col_widths:
+            xs.append(xs[-1] + width)
+
+        canv.setLineWidth(1)
+        ys = [y]
+        for i, (row, font, geom) in enumerate(rows):
+            # Continue on a new page when the next row would cross the bottom margin
+            if ys[-1] - geom["height"] < _PAGE_MARGIN and len(ys) > 1:
+                canv.grid(xs, ys)
+                canv.showPage()
+                canv.setLineWidth(1)
+                ys = [top]
+
+            row_bottom = ys[-1] - geom["height"]
+            if i == 0:
+                canv.setFillColor(colors.lightgrey)
+                canv.rect(xs[0], row_bottom, xs[-1] - xs[0], geom["height"], stroke=0, fill=1)
+                canv.setFillColor(colors.black)
+
+            canv.setFont(font, geom["size"])
+            for c, cell in enumerate(row):
+                canv.drawCentredString((xs[c] + xs[c + 1]) / 2, row_bottom + geom["baseline"], cell)
+            ys.append(row_bottom)
+
+        canv.grid(xs, ys)
+
+    def generate_pdf(self, data: Dict, output_path: str, secondary_work: Optional[Dict] = None):
+        """Generate PDF with processed timesheet data"""
+        # Ensure times are calculated for consistency
+        self._calculate_times_for_all_days(data)
+        # Fonts and styles are set up once per process and shared by all PDFs
+        self._init_pdf_resources()
+
+        # Title with Unicode characters
+        title_text = "Pregled delovnega časa"
+
+        # Employee info
         period_text = f"{data['period']} - {data['name']}"
-        elements.append(Paragraph(period_text, info_style))
 
         # Create table data with Unicode characters
         table_data = [
@@ -336,11 +439,13 @@ class StroskovnikPDFParser:
 
         total_work_hours = 0
         total_break_minutes = 0
+        # The period is the same for every row, so resolve its month and year once
+        date_suffix = self._date_suffix(data["period"])
 
         for day_data in data["table_data"]:
             if day_data["type"] == "business-trip":
                 table_data.append([
-                    self._format_date(day_data["day"], data["period"]),
+                    f"{day_data['day']:02d}{date_suffix}",
                     "-",
                     "-",
                     "Službeno potovanje",
@@ -354,7 +459,7 @@ class StroskovnikPDFParser:
                 work_hours = day_data["totalHours001"]
 
                 table_data.append([
-                    self._format_date(day_data["day"], data["period"]),
+                    f"{day_data['day']:02d}{date_suffix}",
                     arrival_time,
                     departure_time,
                     f"{work_hours:.1f}",
@@ -372,54 +477,32 @@ class StroskovnikPDFParser:
             f"{total_break_minutes} min"
         ])
 
-        # Create and style table
-        # Determine available fonts
-        header_font = 'Arial-Bold' if 'Arial-Bold' in pdfmetrics.getRegisteredFontNames() else 'Helvetica-Bold'
-        body_font = 'Arial' if 'Arial' in pdfmetrics.getRegisteredFontNames() else 'Helvetica'
-
-        table = Table(table_data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), header_font),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -2), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('FONTNAME', (0, 1), (-1, -1), body_font),
-        ]))
-
-        elements.append(table)
-
-        # Build PDF
-        doc.build(elements)
+        # Draw the fixed-layout page directly; no flowable layout engine needed
+        buf = io.BytesIO()
+        canv = canvas.Canvas(buf, pagesize=A4)
+        self._draw_timesheet(canv, title_text, period_text, table_data)
+        canv.showPage()
+        canv.save()
+
+        # Write the finished document in one go and swap it in atomically, so a crash
+        # never leaves a half-written PDF; the pid keeps folder workers' tmp files apart
+        tmp_path = Path(output_path).with_suffix(f".pdf.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(buf.getvalue())
+            os.replace(tmp_path, output_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
     def _generate_filename(self, data: Dict) -> str:
         """Generate filename matching chrome extension format"""
-        month_names = {
-            'januar': 'Januar', 'februar': 'Februar', 'marec': 'Marec', 'april': 'April',
-            'maj': 'Maj', 'junij': 'Junij', 'julij': 'Julij', 'avgust': 'Avgust',
-            'september': 'September', 'oktober': 'Oktober', 'november': 'November', 'december': 'December'
-        }
-
-        # Extract month and year from period
-        month_match = re.search(r'(\w+)\s+(\d{4})', data['period'])
-        if month_match:
-            month_name = month_names.get(month_match.group(1).lower(), 'Oktober')
-            year = month_match.group(2)
-        else:
-            month_name = 'Oktober'
-            year = '2025'
-
         # Use month number for better sorting
         month_num = data.get('month_num', '10')
         year = data.get('year', '2025')
 
         # Clean name for filename
-        clean_name = re.sub(r'[^a-zA-Z\s]', '', data['name'])
-        clean_name = re.sub(r'\s+', '_', clean_name).strip()
+        clean_name = _NON_ALPHA_RE.sub('', data['name'])
+        clean_name = _WS_RE.sub('_', clean_name).strip()
 
         if not clean_name:
             clean_name = 'Timesheet'
@@ -430,54 +513,34 @@ class StroskovnikPDFParser:
         """Generate filename for secondary work PDF"""
         base_filename = self._generate_filename(data)
         work_name = secondary_work.get("name", "Secondary").replace(" ", "_")
-        work_name = re.sub(r'[^a-zA-Z0-9_]', '', work_name)
+        work_name = _NON_ALNUM_RE.sub('', work_name)
         return f"{base_filename}_{work_name}"
 
-    def _create_secondary_data(self, data: Dict, secondary_work: Dict) -> Dict:
-        """Create secondary work data based on primary work times"""
-        import random
-        secondary_data = copy.deepcopy(data)
-
-        # Calculate times for all days first to get concrete arrival/departure times
-        extracted_times = []
-        for day_data in data["table_data"]:
-            if day_data["type"] == "business-trip":
-                extracted_times.append({
-                    "day": day_data["day"],
-                    "type": "business-trip",
-                    "arrival": "-",
-                    "departure": "-",
-                    "totalHours": day_data["totalHours001"] + day_data["totalHours002"],
-                    "workHours": 0,
-                    "breakMinutes": 0
-                })
-            else:
-                times = self.calculate_times(day_data["totalHours001"])
-                extracted_times.append({
-                    "day": day_data["day"],
-                    "type": "normal-work",
-                    "arrival": times["arrival"],
-                    "departure": times["departure"],
-                    "totalHours": day_data["totalHours001"],
-                    "workHours": day_data["totalHours001"],
-                    "breakMinutes": times["break_minutes"]
-                })
-
     def _calculate_times_for_all_days(self, data: Dict) -> None:
         """Calculate and store times for all days in the data for consistency"""
-        for day_data in data["table_data"]:
-            if day_data["type"] != "business-trip" and "arrival" not in day_data:
-                times = self.calculate_times(day_data["totalHours001"])
-                day_data["arrival"] = times["arrival"]
-                day_data["departure"] = times["departure"]
-                day_data["breakMinutes"] = times["break_minutes"]
+        days = [day_data for day_data in data["table_data"]
+                if day_data["type"] != "business-trip" and "arrival" not in day_data]
+        if not days:
+            return
+
+        # Draw every day's variation up front, reading the config once; the random
+        # module is reseeded after fork, so folder workers get independent draws
+        scattering = self.config["scattering_minutes"]
+        variations = [random.randint(-scattering, scattering) for _ in days]
+
+        for day_data, variation in zip(days, variations):
+            times = self.calculate_times(day_data["totalHours001"], variation)
+            day_data["arrival"] = times["arrival"]
+            day_data["departure"] = times["departure"]
+            day_data["breakMinutes"] = times["break_minutes"]
 
     def _create_secondary_data(self, data: Dict, secondary_work: Dict) -> Dict:
         """Create secondary work data based on primary work times"""
         # Ensure times are calculated for primary work
         self._calculate_times_for_all_days(data)
 
-        secondary_data = copy.deepcopy(data)
+        # Shallow copy is enough: only table_data is replaced, nothing nested is mutated
+        secondary_data = dict(data)
 
         # Create secondary work data
         secondary_table_data = []
@@ -525,23 +588,17 @@ class StroskovnikPDFParser:
         secondary_data["table_data"] = secondary_table_data
         return secondary_data
 
-    def _format_date(self, day: int, period: str) -> str:
-        """Format date for PDF output"""
-        month_match = re.search(r'(\w+)\s+(\d{4})', period)
+    def _date_suffix(self, period: str) -> str:
+        """Return the ".MM.YYYY" part of the output dates for a period such as september 2025"""
+        month_match = _MONTH_YEAR_RE.search(period)
         if month_match:
             month_name = month_match.group(1).lower()
             year = month_match.group(2)
 
-            months = {
-                'januar': '01', 'februar': '02', 'marec': '03', 'april': '04',
-                'maj': '05', 'junij': '06', 'julij': '07', 'avgust': '08',
-                'september': '09', 'oktober': '10', 'november': '11', 'december': '12'
-            }
+            month = _MONTH_NUM.get(month_name, '10')
+            return f".{month}.{year}"
 
-            month = months.get(month_name, '10')
-            return f"{day:02d}.{month}.{year}"
-
-        return f"{day:02d}.10.2025"  # Default fallback
+        return ".10.2025"  # Default fallback
 
     def process_file(self, input_path: str, output_path: Optional[str] = None, secondary_work: Optional[Dict] = None) -> bool:
         """Process a single PDF file"""
@@ -553,9 +610,13 @@ class StroskovnikPDFParser:
             print("Failed to parse PDF data")
             return False
 
+        return self._process_parsed(data, input_path, output_path, secondary_work)
+
+    def _process_parsed(self, data: Dict, input_path: str, output_path: Optional[str] = None,
+                        secondary_work: Optional[Dict] = None) -> bool:
+        """Generate the output PDF(s) for already parsed timesheet data"""
         # Generate output path
         if not output_path:
-            input_file = Path(input_path)
             output_dir = Path(self.config["output_dir"])
             output_dir.mkdir(exist_ok=True)
 
@@ -611,27 +672,19 @@ class StroskovnikPDFParser:
         output_dir = Path(self.config["output_dir"])
         output_dir.mkdir(exist_ok=True)
 
-        success_count = 0
         total_count = len(pdf_files)
 
-        for pdf_file in sorted(pdf_files):
-            print(f"\n--- Processing {pdf_file.name} ---")
-
-            # Parse PDF to get period info for organizing output
-            data = self.parse_pdf(str(pdf_file))
-            if not data:
-                print(f"Failed to parse {pdf_file.name}, skipping...")
-                continue
-
-            # Generate base filename
-            base_name = self._generate_filename(data)
-            output_path = output_dir / f"{base_name}.pdf"
+        # Files are independent, so parse and render them in parallel worker processes;
+        # sorting keeps the reported order deterministic
+        tasks = [(str(pdf_file), str(output_dir), secondary_work, self.config) for pdf_file in sorted(pdf_files)]
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, total_count)) as ex:
+            results = list(ex.map(_process_folder_file, tasks))
 
-            # Process the file
-            if self.process_file(str(pdf_file), str(output_path), secondary_work):
+        success_count = 0
+        for success, log in results:
+            print(log, end="")
+            if success:
                 success_count += 1
-            else:
-                print(f"Failed to process {pdf_file.name}")
 
         print(f"\n--- Bulk processing complete ---")
         print(f"Successfully processed: {success_count}/{total_count} files")
@@ -639,6 +692,35 @@ class StroskovnikPDFParser:
         return success_count > 0
 
 
+def _process_folder_file(task: Tuple[str, str, Optional[Dict], Dict]) -> Tuple[bool, str]:
+    """Process one PDF of a folder run in a worker process; returns (success, captured output)"""
+    input_path, output_dir, secondary_work, config = task
+    pdf_file = Path(input_path)
+    parser = StroskovnikPDFParser(config=config)
+
+    # Capture output so each file's log is printed in one piece by the parent
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        print(f"\n--- Processing {pdf_file.name} ---")
+
+        # Parse PDF to get period info for organizing output
+        data = parser.parse_pdf(input_path)
+        if not data:
+            print(f"Failed to parse {pdf_file.name}, skipping...")
+            return False, log.getvalue()
+
+        # Generate base filename
+        base_name = parser._generate_filename(data)
+        output_path = Path(output_dir) / f"{base_name}.pdf"
+
+        # Process the already parsed data
+        success = parser._process_parsed(data, input_path, str(output_path), secondary_work)
+        if not success:
+            print(f"Failed to process {pdf_file.name}")
+
+    return success, log.getvalue()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Stroskovnik PDF Parser - Extract and reformat timesheet data")
     parser.add_argument("input", help="Input PDF file path or folder containing PDF files")